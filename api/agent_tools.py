@@ -5,10 +5,15 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Type
 
 from supabase import Client, create_client
 
+from api.compensation import get_store
+from api.singleflight import SingleFlight, coalesce
 from api.types import Compensation, Department, Incident, OfficerReal
 
 T = TypeVar("T")
 
+# concurrent identical tool calls share one Supabase round trip
+TOOL_FLIGHT = SingleFlight()
+
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
@@ -67,6 +72,7 @@ def _execute_with_column_fallback(
     raise RuntimeError("No valid column found for query")
 
 
+@coalesce(TOOL_FLIGHT)
 def get_officer_by_employee_id(employee_id: int) -> Optional[OfficerReal]:
     print('get_officer_by_employee_id called with employee_id:', employee_id)
     supabase = _get_supabase()
@@ -78,6 +84,7 @@ def get_officer_by_employee_id(employee_id: int) -> Optional[OfficerReal]:
     return _row_to_dataclass(OfficerReal, response.data)
 
 
+@coalesce(TOOL_FLIGHT)
 def list_officers(limit: int = 50, offset: int = 0) -> List[OfficerReal]:
     print('list_officers called with limit:', limit, 'offset:', offset)
 
@@ -92,6 +99,7 @@ def list_officers(limit: int = 50, offset: int = 0) -> List[OfficerReal]:
     return _rows_to_dataclasses(OfficerReal, response.data or [])
 
 
+@coalesce(TOOL_FLIGHT)
 def find_officers_by_name(
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
@@ -108,6 +116,7 @@ def find_officers_by_name(
     return _rows_to_dataclasses(OfficerReal, response.data or [])
 
 
+@coalesce(TOOL_FLIGHT)
 def get_compensation_for_employee(
     employee_id: int,
     year: Optional[int] = None,
@@ -125,6 +134,7 @@ def get_compensation_for_employee(
     return _rows_to_dataclasses(Compensation, data)
 
 
+@coalesce(TOOL_FLIGHT)
 def get_compensation_by_year(year: int, limit: int = 200) -> List[Compensation]:
     print('get_compensation_by_year called with year:', year, 'limit:', limit)
     supabase = _get_supabase()
@@ -139,6 +149,7 @@ def get_compensation_by_year(year: int, limit: int = 200) -> List[Compensation]:
     return _rows_to_dataclasses(Compensation, response.data or [])
 
 
+@coalesce(TOOL_FLIGHT)
 def get_incidents_for_employee(
     employee_id: int,
     limit: int = 100,
@@ -154,6 +165,7 @@ def get_incidents_for_employee(
     return _rows_to_dataclasses(Incident, data[:limit])
 
 
+@coalesce(TOOL_FLIGHT)
 def get_incidents_by_year(year: int, limit: int = 100) -> List[Incident]:
     print('get_incidents_by_year called with year:', year, 'limit:', limit)
     supabase = _get_supabase()
@@ -168,6 +180,7 @@ def get_incidents_by_year(year: int, limit: int = 100) -> List[Incident]:
     return _rows_to_dataclasses(Incident, response.data or [])
 
 
+@coalesce(TOOL_FLIGHT)
 def list_departments(limit: int = 100) -> List[Department]:
     print('list_departments called with limit:', limit)
     supabase = _get_supabase()
@@ -181,6 +194,7 @@ def list_departments(limit: int = 100) -> List[Department]:
     return _rows_to_dataclasses(Department, response.data or [])
 
 
+@coalesce(TOOL_FLIGHT)
 def get_department_by_employee_id(employee_id: int) -> Optional[Department]:
     print('get_department_by_employee_id called with employee_id:', employee_id)
     supabase = _get_supabase()
@@ -192,6 +206,7 @@ def get_department_by_employee_id(employee_id: int) -> Optional[Department]:
     return _row_to_dataclass(Department, response.data)
 
 
+@coalesce(TOOL_FLIGHT)
 def get_officer_profile(employee_id: int) -> Dict[str, Any]:
     print('get_officer_profile called with employee_id:', employee_id)
     officer = get_officer_by_employee_id(employee_id)
@@ -200,4 +215,28 @@ def get_officer_profile(employee_id: int) -> Dict[str, Any]:
         "compensation": get_compensation_for_employee(employee_id),
         "incidents": get_incidents_for_employee(employee_id),
         "department": get_department_by_employee_id(employee_id),
-    }
\ No newline at end of file
+    }
+
+
+def get_compensation_percentile(
+    employee_id: int,
+    year: int,
+    component: str = "total_pay",
+) -> Optional[Dict[str, Any]]:
+    print('get_compensation_percentile called with employee_id:', employee_id, 'year:', year, 'component:', component)
+    return get_store().percentile(employee_id, year, component)
+
+
+def get_overtime_share(employee_id: int, year: Optional[int] = None) -> List[Dict[str, Any]]:
+    print('get_overtime_share called with employee_id:', employee_id, 'year:', year)
+    return get_store().ot_share(employee_id, year)
+
+
+def get_compensation_growth(employee_id: int, component: str = "total_pay") -> List[Dict[str, Any]]:
+    print('get_compensation_growth called with employee_id:', employee_id, 'component:', component)
+    return get_store().yoy_growth(employee_id, component)
+
+
+def get_top_earners(year: int, component: str = "total_pay", limit: int = 10) -> List[Dict[str, Any]]:
+    print('get_top_earners called with year:', year, 'component:', component, 'limit:', limit)
+    return get_store().top_earners(year, component, limit)
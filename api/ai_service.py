@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from flask import json
 from google import genai
 from google.genai import types
@@ -6,6 +7,7 @@ import requests
 from ollama import chat
 from ollama import ChatResponse
 from supabase import create_client
+from api.llm_scheduler import default_scheduler
 from api.tools import TOOL_FUNCTIONS, tools
 
 client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
@@ -15,9 +17,16 @@ supabase_key = os.environ.get("SUPABASE_KEY")
 
 supabase_client = create_client(supabase_url, supabase_key)
 
-def interpret_query(model: str, user_prompt: str) -> str:
+# every model call goes through here so bursts queue instead of hitting provider limits
+SCHEDULER = default_scheduler()
+
+def interpret_query(model: str, user_prompt: str, priority: int = 1, timeout: Optional[float] = None) -> str:
     if model == "gemini":
-      response = client.models.generate_content(
+      response = SCHEDULER.call(
+          "gemini",
+          client.models.generate_content,
+          priority=priority,
+          timeout=timeout,
           model="gemini-2.5-flash-lite",
           contents=user_prompt,
           config=types.GenerateContentConfig(
@@ -42,7 +51,12 @@ def interpret_query(model: str, user_prompt: str) -> str:
               except Exception as e:
                   print(f"Error calling tool {function_name}: {e}")
 
-              final_output = client.models.generate_content(
+              # the follow-up jumps ahead of new prompts, this request already holds a turn
+              final_output = SCHEDULER.call(
+                  "gemini",
+                  client.models.generate_content,
+                  priority=priority - 1,
+                  timeout=timeout,
                   model="gemini-2.5-flash-lite",
                   contents=[
                       # 1️⃣ original user message
@@ -75,7 +89,7 @@ def interpret_query(model: str, user_prompt: str) -> str:
       return None
     
     if model == "ollama":
-      response: ChatResponse = chat(model='qwen2.5', messages=[
+      response: ChatResponse = SCHEDULER.call("ollama", chat, priority=priority, timeout=timeout, model='qwen2.5', messages=[
         {
           'role': 'user',
           'content': user_prompt,
@@ -5,14 +5,21 @@ import os
 from google import genai
 from supabase import create_client
 
-from api.ai_service import interpret_query
+from api.agent_tools import TOOL_FLIGHT
+from api.ai_service import SCHEDULER, interpret_query
+from api.llm_scheduler import SchedulerOverloaded
+from api.singleflight import SingleFlight, coalesce_request
+from api.spatial import (
+    build_district_index,
+    load_district_positions,
+    parse_coordinates,
+)
 
 load_dotenv()
 
 genAiKey = api_key=os.getenv("GEMINI_API_KEY")
 supabase_url = os.environ.get("SUPABASE_URL")
 supabase_key = os.environ.get("SUPABASE_KEY")
-import pandas as pd
 from supabase import create_client
 from mock_data import MOCK_DEPARTMENTS
 
@@ -21,7 +28,8 @@ try:
 except ImportError:
     create_client = None
 
-COORDS = pd.read_csv("../data/district_latlong.csv")
+DISTRICT_POSITIONS = load_district_positions("../data/district_latlong.csv")
+DISTRICT_INDEX = build_district_index(DISTRICT_POSITIONS)
 
 # CLIENNNTTT 
 url = os.environ.get("SUPABASE_URL")
@@ -31,6 +39,9 @@ db = create_client(url, key) if create_client and url and key else None
 app = Flask(__name__)
 CORS(app)
 
+ROUTE_FLIGHT = SingleFlight()
+coalesce_route = coalesce_request(ROUTE_FLIGHT)
+
 client = genai.Client(api_key=genAiKey)
 supabase_client = create_client(supabase_url, supabase_key)
 
@@ -39,19 +50,60 @@ def health_check():
     return "alive"
 
 
+@app.route('/metrics/coalescing')
+def get_coalescing_metrics():
+    return {"message": {"routes": ROUTE_FLIGHT.stats(), "tools": TOOL_FLIGHT.stats()}}
+
+
+@app.route('/metrics/llm')
+def get_llm_metrics():
+    return {"message": SCHEDULER.stats()}
+
+
+# (lowest, highest, default). Tool follow-ups run at priority - 1, so clients
+# can only ever queue behind them, never ahead.
+PROMPT_PRIORITY_RANGE = (1, 9, 1)
+PROMPT_TIMEOUT_RANGE = (1.0, 60.0, 30.0)
+
+
+def _bounded_number(data, key, cast, bounds):
+    low, high, default = bounds
+    value = data.get(key, default)
+    if isinstance(value, bool):
+        return None
+    try:
+        value = cast(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if value != value:  # NaN
+        return None
+    return min(high, max(low, value))
+
+
 @app.route('/api/prompt', methods = ['POST'])
 async def prompt():
 
     print(request.get_json())
     data = request.get_json()
 
-    query_output = interpret_query(data['model'], data['prompt'])
+    if not isinstance(data, dict) or 'model' not in data or 'prompt' not in data:
+        return {"error": "model and prompt are required"}, 400
+    priority = _bounded_number(data, 'priority', int, PROMPT_PRIORITY_RANGE)
+    timeout = _bounded_number(data, 'timeout', float, PROMPT_TIMEOUT_RANGE)
+    if priority is None or timeout is None:
+        return {"error": "priority and timeout must be numbers"}, 400
+
+    try:
+        query_output = interpret_query(data['model'], data['prompt'], priority=priority, timeout=timeout)
+    except SchedulerOverloaded as e:
+        return {"error": str(e), "retry_after": e.retry_after}, 429, {"Retry-After": str(max(1, round(e.retry_after)))}
 
     return {
         "output": query_output
     }
 
 @app.route('/officers')
+@coalesce_route
 def get_officer_data():
     """ 
     SELECT * from officers where first_name='John' and last_name='Smith'
@@ -63,22 +115,33 @@ def get_officer_data():
     
     return {"message": response.data}
 
+
+def _officers_by_district(districts):
+    officers = {district: [] for district in districts}
+    if db is None or not districts:
+        return officers
+    rows = db.table("districts").select("*, officers_real(*)").in_("patrol_district", districts).execute().data
+    for o in rows:
+        officers[o["patrol_district"]].append({"first_name": o["officers_real"]["first_name"], "last_name": o["officers_real"]["last_name"], "employee_id": o["officers_real"]["employee_id"]})
+    return officers
+
+
 @app.route('/departments/incidents')
+@coalesce_route
 def get_all_departments_and_officers():
     """
     read func name lol :((( )))
     """
     unique_districts = db.table("districts").select("patrol_district").execute().data
     unique_districts = list(set([d["patrol_district"] for d in unique_districts]))
+    officers_by_district = _officers_by_district(unique_districts)
     districts = []
 
     for district in unique_districts: 
-        officers = db.table("districts").select("*, officers_real(*)").eq("patrol_district", district).execute().data
-        officers = [{"first_name": o["officers_real"]["first_name"], "last_name": o["officers_real"]["last_name"], "employee_id": o["officers_real"]["employee_id"]} for o in officers]
         dist_dict = {
             "district": district,
-            "officers": officers,
-            "position": [COORDS[COORDS["district"] == district]["latitude"].values[0], COORDS[COORDS["district"] == district]["longitude"].values[0]],
+            "officers": officers_by_district[district],
+            "position": list(DISTRICT_POSITIONS[district]),
             "mapping_score": 0.85 # todo get score 
         }
         
@@ -107,7 +170,59 @@ def get_all_departments_and_officers():
     
 
 
+@app.route('/departments/viewport')
+@coalesce_route
+def get_departments_in_viewport():
+    """
+    Districts whose station falls inside the map bounds.
+    Query params: south, west, north, east (degrees)
+      - officers: "false" to skip the officer lookup
+    """
+    bounds = parse_coordinates(request.args, ("south", "west", "north", "east"))
+    if bounds is None:
+        return {"message": "south, west, north and east are required numbers"}, 400
+
+    visible = DISTRICT_INDEX.query_bbox(*bounds)
+    include_officers = request.args.get("officers", "true").lower() != "false"
+    officers = _officers_by_district(visible) if include_officers else {}
+
+    return {"message": [
+        {
+            "district": district,
+            "officers": officers.get(district, []),
+            "position": list(DISTRICT_POSITIONS[district]),
+            "mapping_score": 0.85 # todo get score
+        }
+        for district in visible
+    ]}
+
+
+@app.route('/departments/nearest')
+def get_nearest_departments():
+    """
+    Closest districts to a point.
+    Query params: lat, lng, k (default 1)
+    """
+    point = parse_coordinates(request.args, ("lat", "lng"))
+    if point is None:
+        return {"message": "lat and lng are required numbers"}, 400
+    try:
+        k = max(1, int(request.args.get("k", 1)))
+    except ValueError:
+        return {"message": "k must be an integer"}, 400
+
+    return {"message": [
+        {
+            "district": district,
+            "position": list(DISTRICT_POSITIONS[district]),
+            "distance_km": round(distance, 3),
+        }
+        for distance, district in DISTRICT_INDEX.nearest(*point, k=k)
+    ]}
+
+
 @app.route("/departments/incidents/<department_id>")
+@coalesce_route
 def get_incidents_by_department(department_id):
     """
     SELECT * FROM incidents WHERE department_id = <department_id>
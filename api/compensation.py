@@ -0,0 +1,181 @@
+import csv
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from api.types import PAY_COMPONENTS
+
+COMPENSATION_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "compensation_table.csv")
+
+
+def _to_float(value: Optional[str]) -> float:
+    if value is None or value.strip() == "":
+        return np.nan
+    return float(value)
+
+
+def _check_component(component: str) -> None:
+    if component not in PAY_COMPONENTS:
+        raise ValueError(f"Unknown pay component {component!r}, expected one of {', '.join(PAY_COMPONENTS)}")
+
+
+@dataclass
+class YearBlock:
+    """All compensation rows for one year, one float64 array per pay component (NaN = missing)."""
+    year: int
+    employee_ids: np.ndarray
+    components: Dict[str, np.ndarray]
+    _sorted: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def sorted_values(self, component: str) -> np.ndarray:
+        if component not in self._sorted:
+            values = self.components[component]
+            self._sorted[component] = np.sort(values[~np.isnan(values)])
+        return self._sorted[component]
+
+
+class CompensationStore:
+    """
+    Read-only, array-backed view of compensation_table.csv. Rows are grouped
+    by year and located through an employee_id -> {year: row} index, so
+    per-officer lookups are dict hits and per-year queries are vectorized.
+    """
+
+    def __init__(self, blocks: Dict[int, YearBlock]):
+        self.blocks = blocks
+        self._index: Dict[int, Dict[int, int]] = {}
+        for year, block in blocks.items():
+            for row, employee_id in enumerate(block.employee_ids.tolist()):
+                self._index.setdefault(employee_id, {})[year] = row
+
+    @classmethod
+    def from_csv(cls, path: str = COMPENSATION_CSV) -> "CompensationStore":
+        grouped: Dict[int, List[Tuple[int, List[float]]]] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                grouped.setdefault(int(row["year"]), []).append(
+                    (int(row["employee_id"]), [_to_float(row.get(c)) for c in PAY_COMPONENTS])
+                )
+
+        blocks = {}
+        for year, rows in grouped.items():
+            pay = np.array([values for _, values in rows], dtype=np.float64)
+            blocks[year] = YearBlock(
+                year=year,
+                employee_ids=np.array([employee_id for employee_id, _ in rows], dtype=np.int64),
+                components={c: pay[:, i].copy() for i, c in enumerate(PAY_COMPONENTS)},
+            )
+        return cls(blocks)
+
+    @property
+    def years(self) -> List[int]:
+        return sorted(self.blocks)
+
+    def _block(self, year: int) -> YearBlock:
+        if year not in self.blocks:
+            raise ValueError(f"No compensation data for {year}")
+        return self.blocks[year]
+
+    def _value(self, employee_id: int, year: int, component: str) -> Optional[float]:
+        row = self._index.get(employee_id, {}).get(year)
+        if row is None:
+            return None
+        value = self.blocks[year].components[component][row]
+        return None if np.isnan(value) else float(value)
+
+    def percentile(self, employee_id: int, year: int, component: str = "total_pay") -> Optional[Dict[str, Any]]:
+        """Percentile rank (share of officers paid at or below) within the year."""
+        _check_component(component)
+        employee_id, year = int(employee_id), int(year)
+        block = self._block(year)
+        value = self._value(employee_id, year, component)
+        if value is None:
+            return None
+        values = block.sorted_values(component)
+        at_or_below = int(np.searchsorted(values, value, side="right"))
+        return {
+            "employee_id": employee_id,
+            "year": year,
+            "component": component,
+            "value": value,
+            "percentile": round(100.0 * at_or_below / len(values), 2),
+            "rank": len(values) - at_or_below + 1,
+            "count": len(values),
+            "median": float(np.median(values)),
+        }
+
+    def ot_share(self, employee_id: int, year: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Overtime as a share of total pay per year, next to the department-wide share."""
+        employee_id = int(employee_id)
+        years = [int(year)] if year is not None else sorted(self._index.get(employee_id, {}))
+        results = []
+        for y in years:
+            ot = self._value(employee_id, y, "ot_pay")
+            total = self._value(employee_id, y, "total_pay")
+            if total is None:
+                continue
+            block = self.blocks[y]
+            results.append({
+                "year": y,
+                "ot_pay": ot or 0.0,
+                "total_pay": total,
+                "ot_share": round((ot or 0.0) / total, 4) if total else None,
+                "department_ot_share": round(
+                    float(np.nansum(block.components["ot_pay"]) / np.nansum(block.components["total_pay"])), 4
+                ),
+            })
+        return results
+
+    def yoy_growth(self, employee_id: int, component: str = "total_pay") -> List[Dict[str, Any]]:
+        """
+        Change from the previous calendar year. Growth is None when the officer
+        has no row for year - 1 (including years missing from the data, e.g. 2019),
+        so multi-year gaps are never reported as year-over-year.
+        """
+        _check_component(component)
+        rows = self._index.get(int(employee_id), {})
+        years = np.array(sorted(rows), dtype=np.int64)
+        values = np.array([self.blocks[y].components[component][rows[y]] for y in years.tolist()], dtype=np.float64)
+        growth = np.full(len(values), np.nan)
+        if len(values) > 1:
+            prev = values[:-1]
+            consecutive = np.diff(years) == 1
+            with np.errstate(divide="ignore", invalid="ignore"):
+                growth[1:] = np.where(consecutive & (prev > 0), (values[1:] - prev) / prev, np.nan)
+        return [
+            {
+                "year": y,
+                "value": None if np.isnan(v) else float(v),
+                "growth": None if np.isnan(g) else round(float(g), 4),
+            }
+            for y, v, g in zip(years.tolist(), values.tolist(), growth.tolist())
+        ]
+
+    def top_earners(self, year: int, component: str = "total_pay", n: int = 10) -> List[Dict[str, Any]]:
+        _check_component(component)
+        # tool-call args from the model can arrive as floats
+        year, n = int(year), int(n)
+        block = self._block(year)
+        values = np.nan_to_num(block.components[component], nan=-np.inf)
+        n = max(0, min(n, len(values)))
+        if n == 0:
+            return []
+        top = np.argpartition(values, -n)[-n:]
+        top = top[np.argsort(values[top])[::-1]]
+        return [
+            {"employee_id": int(block.employee_ids[i]), "year": year, component: float(values[i])}
+            for i in top
+            if np.isfinite(values[i])
+        ]
+
+
+_STORE: Optional[CompensationStore] = None
+
+
+def get_store() -> CompensationStore:
+    global _STORE
+    if _STORE is None:
+        _STORE = CompensationStore.from_csv()
+    return _STORE
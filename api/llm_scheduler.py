@@ -0,0 +1,279 @@
+import heapq
+import itertools
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    # google-genai and ollama both talk over httpx; its connect/read/timeout
+    # errors don't subclass the builtin ConnectionError/TimeoutError
+    from httpx import TransportError
+except ImportError:
+    TransportError = None
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+SERVICE_TIME_ALPHA = 0.2
+
+TRANSPORT_ERRORS = (ConnectionError, TimeoutError) + ((TransportError,) if TransportError else ())
+
+
+class SchedulerOverloaded(Exception):
+    """
+    Raised instead of queuing when a call can't start before its deadline,
+    and when the provider is still rate limiting or unavailable after retries.
+    """
+
+    def __init__(self, model: str, reason: str, retry_after: float):
+        super().__init__(f"{model}: {reason}")
+        self.model = model
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, TRANSPORT_ERRORS):
+        return True
+    # google.genai APIError exposes .code, ollama ResponseError .status_code
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return status in RETRYABLE_STATUS
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, queued: int = 0) -> float:
+        """Seconds until a token is free for the caller behind `queued` others."""
+        self._refill()
+        missing = queued + 1 - self.tokens
+        return max(0.0, missing / self.rate)
+
+
+class _Ticket:
+    def __init__(self, priority: int, seq: int):
+        self.priority = priority
+        self.seq = seq
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class ModelScheduler:
+    """
+    Admission control for one model backend: a token bucket for request
+    rate, a cap on calls in flight, and a priority queue (lower number runs
+    first) for everyone waiting on either. Callers whose deadline can't be
+    met are shed with SchedulerOverloaded rather than left to time out.
+
+    The expected start time combines the token bucket with the slots ahead
+    of the caller, priced at an EWMA of observed call durations seeded by
+    `service_time`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        max_concurrency: int,
+        service_time: float = 1.0,
+        max_queue: int = 64,
+        max_retries: int = 2,
+        base_backoff: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.max_concurrency = max_concurrency
+        self.service_time = service_time
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self._queue: List[_Ticket] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+
+        self.admitted = 0
+        self.shed = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _shed(self, reason: str, retry_after: float) -> SchedulerOverloaded:
+        self.shed += 1
+        return SchedulerOverloaded(self.name, reason, round(max(retry_after, 0.1), 2))
+
+    def _expected_wait(self, priority: int) -> float:
+        """Seconds before a new caller at `priority` would be admitted. Call with the lock held."""
+        ahead = sum(1 for ticket in self._queue if ticket.priority <= priority)
+        rate_wait = self.bucket.wait_time(ahead)
+        # callers ahead plus calls running, beyond what the free slots absorb
+        waiting_for_slot = ahead + self._in_flight - self.max_concurrency + 1
+        slot_wait = 0.0
+        if waiting_for_slot > 0:
+            slot_wait = math.ceil(waiting_for_slot / self.max_concurrency) * self.service_time
+        return max(rate_wait, slot_wait)
+
+    def _acquire(self, priority: int, deadline: Optional[float]) -> None:
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                raise self._shed("queue full", self._expected_wait(priority))
+            expected = self._expected_wait(priority)
+            if deadline is not None and self._clock() + expected > deadline:
+                raise self._shed("deadline before expected start", expected)
+
+            ticket = _Ticket(priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            enqueued = self._clock()
+            try:
+                while True:
+                    if self._queue[0] is ticket and self._in_flight < self.max_concurrency:
+                        if self.bucket.try_acquire():
+                            break
+                        timeout = self.bucket.wait_time()
+                    else:
+                        timeout = None
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            raise self._shed("deadline passed in queue", self._expected_wait(priority))
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._queue)
+            self._in_flight += 1
+            self.admitted += 1
+            waited = self._clock() - enqueued
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            # the next ticket may be runnable too
+            self._cond.notify_all()
+
+    def _release(self, duration: float) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self.service_time += SERVICE_TIME_ALPHA * (duration - self.service_time)
+            self._cond.notify_all()
+
+    def call(
+        self,
+        fn: Callable[..., T],
+        /,
+        *args,
+        priority: int = 1,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> T:
+        deadline = self._clock() + timeout if timeout is not None else None
+        attempt = 0
+        while True:
+            self._acquire(priority, deadline)
+            started = self._clock()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    with self._cond:
+                        self.failures += 1
+                    raise
+                # full jitter exponential backoff
+                backoff = random.uniform(0, self.base_backoff * 2 ** attempt)
+                out_of_time = deadline is not None and self._clock() + backoff >= deadline
+                if attempt >= self.max_retries or out_of_time:
+                    # the provider is pushing back; surface it as backpressure, not a crash
+                    with self._cond:
+                        self.failures += 1
+                    raise SchedulerOverloaded(
+                        self.name,
+                        f"upstream unavailable after {attempt + 1} attempts ({type(e).__name__})",
+                        round(max(self.base_backoff * 2 ** (attempt + 1), 0.1), 2),
+                    ) from e
+                with self._cond:
+                    self.retries += 1
+            finally:
+                self._release(self._clock() - started)
+            attempt += 1
+            self._sleep(backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "retries": self.retries,
+                "failures": self.failures,
+                "avg_wait_ms": round(1000 * self.total_wait / self.admitted, 1) if self.admitted else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait, 1),
+                "service_time_ms": round(1000 * self.service_time, 1),
+            }
+
+
+class LLMScheduler:
+    def __init__(self, models: Dict[str, ModelScheduler]):
+        self.models = models
+
+    def call(self, backend: str, fn: Callable[..., T], /, *args, **kwargs) -> T:
+        return self.models[backend].call(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: scheduler.stats() for name, scheduler in self.models.items()}
+
+
+def _env_float(name: str, default: float) -> float:
+    # blank entries copied from .env_example count as unset
+    return float(os.getenv(name) or default)
+
+
+def default_scheduler() -> LLMScheduler:
+    return LLMScheduler({
+        "gemini": ModelScheduler(
+            "gemini",
+            rate=_env_float("GEMINI_RPM", 15) / 60,
+            burst=_env_float("GEMINI_BURST", 5),
+            max_concurrency=int(_env_float("GEMINI_MAX_CONCURRENCY", 4)),
+            service_time=2.0,
+            max_queue=int(_env_float("GEMINI_MAX_QUEUE", 32)),
+        ),
+        # a single local model; parallel requests only thrash it
+        "ollama": ModelScheduler(
+            "ollama",
+            rate=_env_float("OLLAMA_RPM", 600) / 60,
+            burst=_env_float("OLLAMA_BURST", 2),
+            max_concurrency=int(_env_float("OLLAMA_MAX_CONCURRENCY", 1)),
+            service_time=5.0,
+            max_queue=int(_env_float("OLLAMA_MAX_QUEUE", 16)),
+        ),
+    })
@@ -0,0 +1,97 @@
+import threading
+from collections import Counter
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from flask import request
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Merges concurrent calls that share a key: the first caller runs the
+    function, everyone who arrives while it is in flight waits and gets the
+    same result (or exception). Nothing is cached once the call returns.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed: Counter = Counter()
+        self.coalesced: Counter = Counter()
+
+    def do(self, key: Hashable, fn: Callable[..., T], *args, **kwargs) -> T:
+        name = key[0] if isinstance(key, tuple) and key else key
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed[name] += 1
+            else:
+                self.coalesced[name] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "executed": sum(self.executed.values()),
+                "coalesced": sum(self.coalesced.values()),
+                "in_flight": len(self._calls),
+                "by_name": {
+                    name: {"executed": self.executed[name], "coalesced": self.coalesced[name]}
+                    for name in self.executed | self.coalesced
+                },
+            }
+
+
+def coalesce(flight: SingleFlight) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator keying calls on the function name and its arguments."""
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return fn(*args, **kwargs)
+            return flight.do(key, fn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def coalesce_request(flight: SingleFlight) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator for Flask views: identical requests (same view, path and query
+    string) in flight at once share one run of the view.
+    """
+    def decorator(view: Callable[..., T]) -> Callable[..., T]:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return flight.do((view.__name__, request.full_path), view, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,151 @@
+import csv
+import math
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+KM_PER_DEGREE = 111.195
+LATITUDE_NAMES = ("lat", "south", "north")
+DEFAULT_CELL_SIZE = 0.01  # degrees, roughly 1.1km north/south
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6371.0088 * math.asin(math.sqrt(a))
+
+
+class GridIndex:
+    """
+    Uniform lat/long grid. Each point lands in one bucket, so a bounding box
+    only touches the buckets it overlaps and nearest lookups walk outward
+    ring by ring from the query cell.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self._min_cell: Optional[Tuple[int, int]] = None
+        self._max_cell: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._cells.values())
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def insert(self, lat: float, lng: float, item: Any) -> None:
+        cell = self._cell(lat, lng)
+        self._cells.setdefault(cell, []).append((lat, lng, item))
+        if self._min_cell is None:
+            self._min_cell = self._max_cell = cell
+            return
+        self._min_cell = (min(self._min_cell[0], cell[0]), min(self._min_cell[1], cell[1]))
+        self._max_cell = (max(self._max_cell[0], cell[0]), max(self._max_cell[1], cell[1]))
+
+    def query_bbox(self, south: float, west: float, north: float, east: float) -> List[Any]:
+        if self._min_cell is None or south > north or west > east:
+            return []
+        row_lo, col_lo = self._cell(south, west)
+        row_hi, col_hi = self._cell(north, east)
+        # Clamp to occupied cells so a zoomed-out viewport doesn't scan empty space.
+        row_lo, col_lo = max(row_lo, self._min_cell[0]), max(col_lo, self._min_cell[1])
+        row_hi, col_hi = min(row_hi, self._max_cell[0]), min(col_hi, self._max_cell[1])
+
+        hits = []
+        for row in range(row_lo, row_hi + 1):
+            for col in range(col_lo, col_hi + 1):
+                for lat, lng, item in self._cells.get((row, col), ()):
+                    if south <= lat <= north and west <= lng <= east:
+                        hits.append(item)
+        return hits
+
+    def _ring(self, center: Tuple[int, int], radius: int) -> Iterable[Tuple[int, int]]:
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield (row - radius, c)
+            yield (row + radius, c)
+        for r in range(row - radius + 1, row + radius):
+            yield (r, col - radius)
+            yield (r, col + radius)
+
+    def nearest(self, lat: float, lng: float, k: int = 1) -> List[Tuple[float, Any]]:
+        """Return up to k (distance_km, item) pairs ordered by distance."""
+        if self._min_cell is None or k < 1:
+            return []
+        center = self._cell(lat, lng)
+        max_radius = max(
+            abs(center[0] - self._min_cell[0]),
+            abs(center[0] - self._max_cell[0]),
+            abs(center[1] - self._min_cell[1]),
+            abs(center[1] - self._max_cell[1]),
+        )
+
+        found: List[Tuple[float, Any]] = []
+        for radius in range(max_radius + 1):
+            if 8 * radius > len(self._cells):
+                # Far from the data, a ring has more cells than there are
+                # buckets; finish with a scan of everything not yet visited.
+                for cell, bucket in self._cells.items():
+                    if max(abs(cell[0] - center[0]), abs(cell[1] - center[1])) < radius:
+                        continue
+                    for p_lat, p_lng, item in bucket:
+                        found.append((haversine_km(lat, lng, p_lat, p_lng), item))
+                break
+            for cell in self._ring(center, radius):
+                for p_lat, p_lng, item in self._cells.get(cell, ()):
+                    found.append((haversine_km(lat, lng, p_lat, p_lng), item))
+            if len(found) < k:
+                continue
+            found.sort(key=lambda pair: pair[0])
+            # Anything not yet visited is at least `radius` whole cells away;
+            # longitude degrees are the short side, so bound with those.
+            edge_lat = min(89.0, abs(lat) + radius * self.cell_size)
+            unvisited_km = radius * self.cell_size * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+            if found[k - 1][0] <= unvisited_km:
+                break
+
+        found.sort(key=lambda pair: pair[0])
+        return found[:k]
+
+
+def parse_coordinates(args: Mapping[str, str], names: Iterable[str]) -> Optional[List[float]]:
+    """
+    Read finite lat/long query params, clamped to [-90, 90] for latitudes
+    and [-180, 180] for longitudes. None if any is missing or not a number.
+    """
+    values = []
+    for name in names:
+        try:
+            value = float(args[name])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not math.isfinite(value):
+            return None
+        limit = 90.0 if name in LATITUDE_NAMES else 180.0
+        values.append(min(limit, max(-limit, value)))
+    return values
+
+
+def load_district_positions(path: str) -> Dict[str, Tuple[float, float]]:
+    with open(path, newline="") as f:
+        return {
+            row["district"]: (float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(f)
+        }
+
+
+def build_district_index(
+    positions: Dict[str, Tuple[float, float]],
+    cell_size: float = DEFAULT_CELL_SIZE,
+) -> GridIndex:
+    index = GridIndex(cell_size)
+    for district, (lat, lng) in positions.items():
+        index.insert(lat, lng, district)
+    return index
@@ -0,0 +1,61 @@
+from api.compensation import CompensationStore
+from api.types import Compensation
+
+CSV = """employee_id,year,regular_pay,retro_pay,other_pay,ot_pay,injured_pay,detail_pay,quinn_pay,total_pay
+1,2017,100,,,,,,,100
+1,2018,120,,,30,,,,150
+1,2021,140,,,,,,,300
+2,2018,50,,,0,,,,50
+3,2018,80,,,20,,,,100
+"""
+
+
+def _store(tmp_path):
+    path = tmp_path / "compensation.csv"
+    path.write_text(CSV)
+    return CompensationStore.from_csv(str(path))
+
+
+def test_yoy_growth_only_between_consecutive_years(tmp_path):
+    growth = _store(tmp_path).yoy_growth(1)
+
+    assert [row["year"] for row in growth] == [2017, 2018, 2021]
+    assert growth[0]["growth"] is None
+    assert growth[1]["growth"] == 0.5
+    # 2018 -> 2021 is not year-over-year
+    assert growth[2]["growth"] is None
+    assert growth[2]["value"] == 300.0
+
+
+def test_percentile_and_top_earners(tmp_path):
+    store = _store(tmp_path)
+
+    assert store.percentile(3, 2018)["percentile"] == 66.67
+    assert store.percentile(1, 2018)["rank"] == 1
+    assert store.percentile(99, 2018) is None
+    assert [row["employee_id"] for row in store.top_earners(2018, n=2)] == [1, 3]
+
+
+def test_ot_share(tmp_path):
+    share = _store(tmp_path).ot_share(1, 2018)[0]
+
+    assert share["ot_share"] == 0.2
+    assert share["department_ot_share"] == round(50 / 300, 4)
+
+
+def test_compensation_converts_pay_to_float():
+    row = Compensation(employee_id=1, year=2018, regular_pay="120.5", ot_pay="", detail_pay=3, total_pay=None)
+
+    assert row.regular_pay == 120.5
+    assert row.ot_pay is None
+    assert row.detail_pay == 3.0 and isinstance(row.detail_pay, float)
+    assert row.total_pay is None
+
+
+def test_float_arguments_from_tool_calls(tmp_path):
+    store = _store(tmp_path)
+
+    assert [row["employee_id"] for row in store.top_earners(2018.0, n=2.0)] == [1, 3]
+    assert store.percentile(3.0, 2018.0)["percentile"] == 66.67
+    assert store.ot_share(1.0, 2018.0)[0]["ot_share"] == 0.2
+    assert store.yoy_growth(1.0)[1]["growth"] == 0.5
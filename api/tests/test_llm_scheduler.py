@@ -0,0 +1,227 @@
+import threading
+import time
+
+import pytest
+
+from api.llm_scheduler import ModelScheduler, SchedulerOverloaded, TokenBucket, is_retryable
+
+
+class FakeModel:
+    """Stands in for a model backend: records concurrency and can be held open."""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def __call__(self, name):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.gate.wait()
+        time.sleep(self.duration)
+        with self._lock:
+            self.active -= 1
+            self.calls.append(name)
+        return name
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+def _wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > end:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def _start(scheduler, model, name, errors, **kwargs):
+    def run():
+        try:
+            scheduler.call(model, name, **kwargs)
+        except SchedulerOverloaded as e:
+            errors.append((name, e))
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_token_bucket_refills_with_clock():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=1, clock=lambda: now[0])
+
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.wait_time() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire()
+
+
+def test_concurrency_cap():
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=2)
+    model = FakeModel(duration=0.05)
+    errors = []
+
+    threads = [_start(scheduler, model, i, errors) for i in range(8)]
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(model.calls) == 8
+    assert model.peak == 2
+    assert scheduler.stats()["admitted"] == 8
+
+
+def test_priority_ordering():
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1)
+    model = FakeModel()
+    model.gate.clear()
+    errors = []
+
+    threads = [_start(scheduler, model, "running", errors)]
+    _wait_for(lambda: model.active == 1)
+    for name, priority in (("low", 5), ("mid", 3), ("high", 0)):
+        threads.append(_start(scheduler, model, name, errors, priority=priority))
+        _wait_for(lambda n=len(threads) - 1: scheduler.stats()["queue_depth"] == n)
+    model.gate.set()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert model.calls == ["running", "high", "mid", "low"]
+
+
+def test_queue_full_is_shed():
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1, max_queue=2)
+    model = FakeModel()
+    model.gate.clear()
+    errors = []
+
+    threads = [_start(scheduler, model, "running", errors)]
+    _wait_for(lambda: model.active == 1)
+    threads += [_start(scheduler, model, f"queued-{i}", errors) for i in range(2)]
+    _wait_for(lambda: scheduler.stats()["queue_depth"] == 2)
+
+    with pytest.raises(SchedulerOverloaded) as exc:
+        scheduler.call(model, "overflow")
+    assert exc.value.reason == "queue full"
+
+    model.gate.set()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert scheduler.stats()["shed"] == 1
+
+
+def test_deadline_shed_is_immediate_when_slots_are_busy():
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1, service_time=1.0)
+    model = FakeModel()
+    model.gate.clear()
+    errors = []
+
+    threads = [_start(scheduler, model, "running", errors)]
+    _wait_for(lambda: model.active == 1)
+    # one slot wait fits in 1.5s and is queued
+    threads.append(_start(scheduler, model, "queued", errors, timeout=1.5))
+    _wait_for(lambda: scheduler.stats()["queue_depth"] == 1)
+
+    # a second slot wait doesn't, so it's refused without waiting out the timeout
+    started = time.monotonic()
+    with pytest.raises(SchedulerOverloaded) as exc:
+        scheduler.call(model, "late", timeout=1.5)
+    assert time.monotonic() - started < 0.1
+    assert exc.value.reason == "deadline before expected start"
+    assert exc.value.retry_after == 2.0
+
+    model.gate.set()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_deadline_passed_in_queue():
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1, service_time=0.0)
+    model = FakeModel()
+    model.gate.clear()
+    errors = []
+
+    thread = _start(scheduler, model, "running", errors)
+    _wait_for(lambda: model.active == 1)
+    with pytest.raises(SchedulerOverloaded) as exc:
+        scheduler.call(model, "waiting", timeout=0.1)
+    assert exc.value.reason == "deadline passed in queue"
+    assert scheduler.stats()["queue_depth"] == 0
+
+    model.gate.set()
+    thread.join()
+
+
+def test_retry_on_rate_limit_with_stubbed_sleep():
+    sleeps = []
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1, max_retries=2, sleep=sleeps.append)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited()
+        return "ok"
+
+    assert scheduler.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= scheduler.base_backoff
+    assert 0 <= sleeps[1] <= scheduler.base_backoff * 2
+    assert scheduler.stats()["retries"] == 2
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_retries_exhausted_and_non_retryable_errors_raise():
+    sleeps = []
+    scheduler = ModelScheduler("fake", rate=1000, burst=100, max_concurrency=1, max_retries=1, sleep=sleeps.append)
+
+    def always_limited():
+        raise RateLimited()
+
+    def broken():
+        raise ValueError("bad request")
+
+    with pytest.raises(SchedulerOverloaded) as exc:
+        scheduler.call(always_limited)
+    assert isinstance(exc.value.__cause__, RateLimited)
+    assert exc.value.retry_after == scheduler.base_backoff * 4
+    assert len(sleeps) == 1
+
+    with pytest.raises(ValueError):
+        scheduler.call(broken)
+    assert len(sleeps) == 1
+    assert scheduler.stats()["failures"] == 2
+
+
+def test_retryable_error_past_deadline_is_backpressure():
+    now = [0.0]
+    scheduler = ModelScheduler(
+        "fake", rate=1000, burst=100, max_concurrency=1, base_backoff=10.0, clock=lambda: now[0], sleep=lambda s: None
+    )
+
+    def unavailable():
+        raise ConnectionError("reset")
+
+    with pytest.raises(SchedulerOverloaded):
+        scheduler.call(unavailable, timeout=0.001)
+
+
+def test_httpx_transport_errors_are_retryable():
+    httpx = pytest.importorskip("httpx")
+
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(httpx.ReadTimeout("slow"))
+    assert not is_retryable(ValueError("bad request"))
@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+from flask import Flask, request
+
+from api.singleflight import SingleFlight, coalesce, coalesce_request
+
+THREADS = 12
+
+
+def _run_concurrently(target, args_list):
+    barrier = threading.Barrier(len(args_list))
+    results, errors = [], []
+    lock = threading.Lock()
+
+    def worker(*args):
+        barrier.wait()
+        try:
+            value = target(*args)
+            with lock:
+                results.append(value)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=args) for args in args_list]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_identical_calls_hit_backend_once_per_key():
+    flight = SingleFlight()
+    backend_calls = {}
+    lock = threading.Lock()
+
+    @coalesce(flight)
+    def slow_query(employee_id):
+        with lock:
+            backend_calls[employee_id] = backend_calls.get(employee_id, 0) + 1
+        time.sleep(0.2)
+        return {"employee_id": employee_id}
+
+    results, errors = _run_concurrently(slow_query, [(i % 2,) for i in range(THREADS)])
+
+    assert not errors
+    assert backend_calls == {0: 1, 1: 1}
+    assert sorted(r["employee_id"] for r in results) == [0] * (THREADS // 2) + [1] * (THREADS // 2)
+    stats = flight.stats()
+    assert stats["executed"] == 2
+    assert stats["coalesced"] == THREADS - 2
+    assert stats["by_name"]["slow_query"] == {"executed": 2, "coalesced": THREADS - 2}
+    assert stats["in_flight"] == 0
+
+
+def test_followers_receive_leader_exception():
+    flight = SingleFlight()
+    backend_calls = []
+
+    @coalesce(flight)
+    def failing_query():
+        backend_calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("backend down")
+
+    results, errors = _run_concurrently(failing_query, [()] * THREADS)
+
+    assert not results
+    assert len(backend_calls) == 1
+    assert len(errors) == THREADS
+    assert all(isinstance(e, ValueError) and str(e) == "backend down" for e in errors)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_calls_are_not_cached_after_completion():
+    flight = SingleFlight()
+    backend_calls = []
+
+    @coalesce(flight)
+    def query(x):
+        backend_calls.append(x)
+        return x
+
+    assert query(1) == 1
+    assert query(1) == 1
+    assert len(backend_calls) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_unhashable_arguments_bypass_coalescing():
+    flight = SingleFlight()
+
+    @coalesce(flight)
+    def query(filters):
+        return len(filters)
+
+    assert query({"a": 1}) == 1
+    assert flight.stats()["executed"] == 0
+
+
+@pytest.fixture
+def route_app():
+    app = Flask(__name__)
+    flight = SingleFlight()
+    backend_calls = []
+    lock = threading.Lock()
+
+    @app.route("/officers")
+    @coalesce_request(flight)
+    def officers():
+        with lock:
+            backend_calls.append(request.args.get("employee_id"))
+        time.sleep(0.2)
+        return {"message": [{"employee_id": request.args.get("employee_id")}]}
+
+    return app, flight, backend_calls
+
+
+def test_coalesced_route_under_concurrent_clients(route_app):
+    app, flight, backend_calls = route_app
+
+    def fetch(employee_id):
+        with app.test_client() as client:
+            response = client.get(f"/officers?employee_id={employee_id}")
+            return response.status_code, response.get_json()
+
+    results, errors = _run_concurrently(fetch, [(100 + i % 2,) for i in range(THREADS)])
+
+    assert not errors
+    assert sorted(backend_calls) == ["100", "101"]
+    assert all(status == 200 for status, _ in results)
+    assert sorted(body["message"][0]["employee_id"] for _, body in results) == ["100"] * (THREADS // 2) + ["101"] * (THREADS // 2)
+    assert flight.stats()["by_name"]["officers"] == {"executed": 2, "coalesced": THREADS - 2}
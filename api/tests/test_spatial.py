@@ -0,0 +1,83 @@
+import os
+import random
+
+from api.spatial import GridIndex, build_district_index, haversine_km, load_district_positions, parse_coordinates
+
+DISTRICT_CSV = os.path.join(os.path.dirname(__file__), "..", "..", "data", "district_latlong.csv")
+
+
+def _brute_force_nearest(points, lat, lng, k):
+    return sorted((haversine_km(lat, lng, p_lat, p_lng), item) for item, (p_lat, p_lng) in points.items())[:k]
+
+
+def test_query_bbox_returns_points_inside_bounds():
+    index = GridIndex(cell_size=0.01)
+    index.insert(42.35, -71.06, "inside")
+    index.insert(42.3599, -71.0401, "edge")
+    index.insert(42.40, -71.06, "north")
+    index.insert(42.35, -71.20, "west")
+
+    assert sorted(index.query_bbox(42.30, -71.10, 42.36, -71.0401)) == ["edge", "inside"]
+
+
+def test_query_bbox_handles_empty_and_inverted_bounds():
+    index = GridIndex()
+    assert index.query_bbox(42.0, -72.0, 43.0, -71.0) == []
+
+    index.insert(42.35, -71.06, "a")
+    assert index.query_bbox(43.0, -72.0, 42.0, -71.0) == []
+    assert index.query_bbox(-90, -180, 90, 180) == ["a"]
+
+
+def test_district_bbox_matches_linear_scan():
+    positions = load_district_positions(DISTRICT_CSV)
+    index = build_district_index(positions)
+    south, west, north, east = 42.30, -71.10, 42.36, -71.04
+
+    expected = {
+        district for district, (lat, lng) in positions.items()
+        if south <= lat <= north and west <= lng <= east
+    }
+    assert expected
+    assert set(index.query_bbox(south, west, north, east)) == expected
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(0)
+    points = {i: (42.2 + rng.random() * 0.3, -71.25 + rng.random() * 0.3) for i in range(200)}
+    index = GridIndex(cell_size=0.01)
+    for item, (lat, lng) in points.items():
+        index.insert(lat, lng, item)
+
+    for _ in range(300):
+        lat, lng = 42.1 + rng.random() * 0.5, -71.35 + rng.random() * 0.5
+        k = rng.randint(1, 10)
+        assert index.nearest(lat, lng, k) == _brute_force_nearest(points, lat, lng, k)
+
+
+def test_nearest_far_from_data_and_k_larger_than_index():
+    positions = load_district_positions(DISTRICT_CSV)
+    index = build_district_index(positions)
+
+    result = index.nearest(0.0, 0.0, k=len(positions) + 5)
+    assert [d for _, d in result] == [d for _, d in _brute_force_nearest(positions, 0.0, 0.0, len(positions))]
+    assert index.nearest(42.35, -71.06, k=0) == []
+    assert GridIndex().nearest(42.35, -71.06) == []
+
+
+def test_parse_coordinates_rejects_non_finite_and_clamps():
+    assert parse_coordinates({"lat": "42.35", "lng": "-71.06"}, ("lat", "lng")) == [42.35, -71.06]
+    for bad in ("nan", "inf", "-inf", "1e400", "abc", ""):
+        assert parse_coordinates({"lat": bad, "lng": "0"}, ("lat", "lng")) is None
+    assert parse_coordinates({"lat": "1"}, ("lat", "lng")) is None
+
+    bounds = parse_coordinates(
+        {"south": "-1e308", "west": "-200", "north": "1e308", "east": "200"},
+        ("south", "west", "north", "east"),
+    )
+    assert bounds == [-90.0, -180.0, 90.0, 180.0]
+
+    index = GridIndex()
+    index.insert(42.35, -71.06, "a")
+    assert index.query_bbox(*bounds) == ["a"]
+    assert [d for _, d in index.nearest(*parse_coordinates({"lat": "1e308", "lng": "0"}, ("lat", "lng")))] == ["a"]
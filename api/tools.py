@@ -1,5 +1,8 @@
 from google.genai import types
 from api import agent_tools 
+from api.types import PAY_COMPONENTS
+
+_PAY_COMPONENT_PARAM = {"type": "string", "enum": list(PAY_COMPONENTS)}
 
 
 tools = [
@@ -119,6 +122,56 @@ tools = [
                     "required": ["employee_id"],
                 },
             ),
+            types.FunctionDeclaration(
+                name="get_compensation_percentile",
+                description="Percentile rank of an officer's pay among all officers in a year",
+                parameters={
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "integer"},
+                        "year": {"type": "integer"},
+                        "component": _PAY_COMPONENT_PARAM
+                    },
+                    "required": ["employee_id", "year"],
+                },
+            ),
+            types.FunctionDeclaration(
+                name="get_overtime_share",
+                description="Share of an officer's total pay that came from overtime, per year, with the department-wide share",
+                parameters={
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "integer"},
+                        "year": {"type": "integer"}
+                    },
+                    "required": ["employee_id"],
+                },
+            ),
+            types.FunctionDeclaration(
+                name="get_compensation_growth",
+                description="Year-over-year growth of an officer's pay",
+                parameters={
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "integer"},
+                        "component": _PAY_COMPONENT_PARAM
+                    },
+                    "required": ["employee_id"],
+                },
+            ),
+            types.FunctionDeclaration(
+                name="get_top_earners",
+                description="Highest paid officers in a year",
+                parameters={
+                    "type": "object",
+                    "properties": {
+                        "year": {"type": "integer"},
+                        "component": _PAY_COMPONENT_PARAM,
+                        "limit": {"type": "integer", "minimum": 1}
+                    },
+                    "required": ["year"],
+                },
+            ),
         ]
     )
 ]
@@ -135,4 +188,8 @@ TOOL_FUNCTIONS = {
     "list_departments": agent_tools.list_departments,
     "get_department_by_employee_id": agent_tools.get_department_by_employee_id,
     "get_officer_profile": agent_tools.get_officer_profile,
+    "get_compensation_percentile": agent_tools.get_compensation_percentile,
+    "get_overtime_share": agent_tools.get_overtime_share,
+    "get_compensation_growth": agent_tools.get_compensation_growth,
+    "get_top_earners": agent_tools.get_top_earners,
 }
@@ -10,19 +10,41 @@ class OfficerReal:
     rank: Optional[str] = None
 
 
+PAY_COMPONENTS = (
+    "regular_pay",
+    "retro_pay",
+    "other_pay",
+    "ot_pay",
+    "injured_pay",
+    "detail_pay",
+    "quinn_pay",
+    "total_pay",
+)
+
+
 @dataclass
 class Compensation:
     employee_id: int  # PK (composite)
     year: int        # PK (composite)
-    regular_pay: Optional[str] = None
-    retro_pay: Optional[str] = None
-    other_pay: Optional[str] = None
-    ot_pay: Optional[str] = None
-    injured_pay: Optional[str] = None
-    detail_pay: Optional[str] = None
-    quinn_pay: Optional[str] = None
+    regular_pay: Optional[float] = None
+    retro_pay: Optional[float] = None
+    other_pay: Optional[float] = None
+    ot_pay: Optional[float] = None
+    injured_pay: Optional[float] = None
+    detail_pay: Optional[float] = None
+    quinn_pay: Optional[float] = None
     total_pay: Optional[float] = None
 
+    def __post_init__(self):
+        # Supabase can hand back numeric columns as strings (or "" for blanks)
+        for name in PAY_COMPONENTS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                value = value.strip()
+                setattr(self, name, float(value) if value else None)
+            elif isinstance(value, int):
+                setattr(self, name, float(value))
+
 
 @dataclass
 class Incident: